@@ -0,0 +1,287 @@
+import numpy as np
+import pandas as pd
+
+from strategies.rsi_strategy import RSIStrategy
+from strategies.macd_strategy import MACDStrategy
+
+# numba为可选依赖，未安装时退化为纯Python执行
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def ema(values, period):
+    """
+    计算指数移动平均（与backtrader的EMA一致，以前period根的简单均值为种子）
+
+    参数:
+    values (numpy.ndarray): 输入序列，可包含前导NaN
+    period (int): 周期
+
+    返回:
+    numpy.ndarray: EMA序列，不足周期的位置为NaN
+    """
+    return _smooth(values, period, 2.0 / (period + 1))
+
+
+def smma(values, period):
+    """
+    计算平滑移动平均（Wilder平滑，与backtrader的SMMA一致）
+
+    参数:
+    values (numpy.ndarray): 输入序列，可包含前导NaN
+    period (int): 周期
+
+    返回:
+    numpy.ndarray: SMMA序列，不足周期的位置为NaN
+    """
+    return _smooth(values, period, 1.0 / period)
+
+
+def _smooth(values, period, alpha):
+    return _smooth_kernel(np.asarray(values, dtype=np.float64), period, alpha)
+
+
+@njit(cache=True)
+def _smooth_kernel(values, period, alpha):
+    result = np.full(len(values), np.nan)
+    first = 0
+    while first < len(values) and np.isnan(values[first]):
+        first += 1
+    if len(values) - first < period:
+        return result
+    start = first + period - 1
+    result[start] = values[first:start + 1].mean()
+    for i in range(start + 1, len(values)):
+        result[i] = result[i - 1] * (1.0 - alpha) + values[i] * alpha
+    return result
+
+
+@njit(cache=True)
+def _crossover(line1, line2):
+    """
+    计算交叉信号（与backtrader的CrossOver一致）：上穿为1，下穿为-1，否则为0
+    """
+    diff = line1 - line2
+    cross = np.zeros(len(diff))
+    last_nonzero = np.nan
+    for i in range(len(diff)):
+        if np.isnan(diff[i]):
+            continue
+        if last_nonzero < 0 and diff[i] > 0:
+            cross[i] = 1.0
+        elif last_nonzero > 0 and diff[i] < 0:
+            cross[i] = -1.0
+        if diff[i] != 0 or np.isnan(last_nonzero):
+            last_nonzero = diff[i]
+    return cross
+
+
+def macd_signals(close, macd1=12, macd2=26, macdsig=9):
+    """
+    按MACDStrategy的规则生成买卖信号
+
+    参数:
+    close (numpy.ndarray): 收盘价
+    macd1 (int): 快线周期
+    macd2 (int): 慢线周期
+    macdsig (int): 信号线周期
+
+    返回:
+    tuple: (买入信号, 卖出信号, 策略开始运行的bar序号)
+    """
+    macd = ema(close, macd1) - ema(close, macd2)
+    signal = ema(macd, macdsig)
+    mcross = _crossover(macd, signal)
+
+    entries = (mcross > 0) & (macd < 0)  # 在0轴下方金叉
+    exits = mcross < 0
+    return entries, exits, macd2 + macdsig - 1
+
+
+def rsi_signals(close, rsi_period=14, rsi_overbought=70, rsi_oversold=30):
+    """
+    按RSIStrategy的规则生成买卖信号
+
+    参数:
+    close (numpy.ndarray): 收盘价
+    rsi_period (int): RSI计算周期
+    rsi_overbought (float): 超买阈值
+    rsi_oversold (float): 超卖阈值
+
+    返回:
+    tuple: (买入信号, 卖出信号, 策略开始运行的bar序号)
+    """
+    change = np.diff(close, prepend=np.nan)
+    up = smma(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), rsi_period)
+    down = smma(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), rsi_period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + up / down)
+
+    entries = rsi < rsi_oversold
+    exits = rsi > rsi_overbought
+    return entries, exits, rsi_period
+
+
+# 策略类 -> 信号生成函数
+SIGNAL_BUILDERS = {
+    RSIStrategy: rsi_signals,
+    MACDStrategy: macd_signals,
+}
+
+
+@njit(cache=True)
+def position_kernel(open_, close, entries, exits, start, trail, trailamount,
+                    initial_cash, commission, size_ratio):
+    """
+    持仓状态机：模拟下单、次日开盘成交、追踪止损和同一时间只有一笔在途订单
+
+    参数:
+    open_ (numpy.ndarray): 开盘价
+    close (numpy.ndarray): 收盘价
+    entries (numpy.ndarray): 买入信号
+    exits (numpy.ndarray): 卖出信号
+    start (int): 策略开始运行的bar序号（指标预热期之后）
+    trail (bool): 是否使用追踪止损
+    trailamount (float): 追踪止损比例
+    initial_cash (float): 初始资金
+    commission (float): 手续费率
+    size_ratio (float): 买入时使用的资金比例
+
+    返回:
+    tuple: (每根bar的账户价值, 已平仓交易的净盈亏, 已平仓交易数, 期末是否持仓)
+    """
+    n = len(close)
+    values = np.empty(n)
+    pnls = np.empty(n)
+    n_closed = 0
+
+    cash = initial_cash
+    size = 0
+    entry_cost = 0.0
+    pending = 0  # 在途订单：1买入，-1卖出
+    pending_size = 0
+    highest_price = 0.0
+    trailing_stop = 0.0
+
+    for i in range(n):
+        # 上一根bar提交的市价单按本bar开盘价成交
+        if pending == 1:
+            price = open_[i]
+            cost = pending_size * price
+            comm = cost * commission
+            if pending_size > 0 and cost + comm <= cash:
+                cash -= cost + comm
+                size = pending_size
+                entry_cost = cost + comm
+                if trail:
+                    highest_price = price
+                    trailing_stop = highest_price * (1.0 - trailamount)
+        elif pending == -1:
+            price = open_[i]
+            proceeds = size * price
+            comm = proceeds * commission
+            cash += proceeds - comm
+            pnls[n_closed] = proceeds - comm - entry_cost
+            n_closed += 1
+            size = 0
+            highest_price = 0.0
+        pending = 0
+
+        if i >= start:
+            if size > 0 and trail:
+                if close[i] > highest_price:
+                    highest_price = close[i]
+                    trailing_stop = highest_price * (1.0 - trailamount)
+                if close[i] < trailing_stop:
+                    pending = -1
+
+            if pending == 0:
+                if size == 0:
+                    if entries[i]:
+                        pending_size = int(cash * size_ratio / close[i])
+                        pending = 1
+                elif exits[i]:
+                    pending = -1
+
+        values[i] = cash + size * close[i]
+
+    return values, pnls[:n_closed], n_closed, size > 0
+
+
+def _yearly_sharpe(values, dates, initial_cash, riskfreerate=0.01):
+    # 与backtrader默认SharpeRatio一致：按年收益率计算，标准差为总体标准差
+    years = dates.year.to_numpy()
+    year_end = values[np.append(years[1:] != years[:-1], True)]
+    prev = np.concatenate(([initial_cash], year_end[:-1]))
+    excess = year_end / prev - 1 - riskfreerate
+    std = excess.std()
+    return float(excess.mean() / std) if std > 0 else None
+
+
+def run_fast_strategy(strategy_class, strategy_params=None, data=None, initial_cash=100000.0,
+                      commission=0.001):
+    """
+    使用编译内核运行单个策略的回测，结果字段与run_strategy一致
+
+    参数:
+    strategy_class: 策略类，需在SIGNAL_BUILDERS中注册
+    strategy_params (dict): 策略参数
+    data (pandas.DataFrame): 股票数据
+    initial_cash (float): 初始资金
+    commission (float): 手续费率
+
+    返回:
+    dict: 回测结果
+    """
+    if data is None or data.empty:
+        print('数据无效，无法回测。')
+        return None
+
+    if strategy_class not in SIGNAL_BUILDERS:
+        raise ValueError(f'策略{strategy_class.__name__}不支持快速回测')
+
+    params = dict(strategy_params or {})
+    trail = params.pop('trail', strategy_class is MACDStrategy)
+    trailamount = params.pop('trailamount', 0.02)
+
+    open_ = data['open'].to_numpy(dtype=np.float64)
+    close = data['close'].to_numpy(dtype=np.float64)
+    entries, exits, start = SIGNAL_BUILDERS[strategy_class](close, **params)
+
+    values, pnls, n_closed, is_open = position_kernel(
+        open_, close, entries, exits, start, trail, trailamount,
+        initial_cash, commission, 0.9
+    )
+
+    end_cash = float(values[-1]) if len(values) else initial_cash
+    total_return = end_cash / initial_cash - 1
+    annual_return = float(np.exp(np.log(end_cash / initial_cash) / len(values) * 252) - 1)
+
+    peak = np.maximum.accumulate(np.concatenate(([initial_cash], values)))
+    max_drawdown = float(((peak[1:] - values) / peak[1:]).max() * 100.0)
+
+    total_trades = n_closed + int(is_open)
+    won_trades = int((pnls >= 0).sum())
+    lost_trades = n_closed - won_trades
+    win_rate = won_trades / total_trades if total_trades > 0 else 0
+
+    return {
+        'initial_cash': initial_cash,
+        'final_cash': end_cash,
+        'total_return': total_return,
+        'annual_return': annual_return,
+        'sharpe_ratio': _yearly_sharpe(values, pd.DatetimeIndex(data.index), initial_cash),
+        'max_drawdown': max_drawdown,
+        'total_trades': total_trades,
+        'won_trades': won_trades,
+        'lost_trades': lost_trades,
+        'win_rate': win_rate
+    }
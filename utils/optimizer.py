@@ -0,0 +1,131 @@
+import itertools
+import math
+
+import numpy as np
+
+# 越小越好的指标，其余指标越大越好
+MINIMIZE_METRICS = {'max_drawdown'}
+
+
+def expand_grid(param_grid):
+    """
+    展开参数网格
+
+    参数:
+    param_grid (dict): 键为参数名，值为候选取值列表
+
+    返回:
+    list: 参数组合字典的列表
+    """
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+def _slice_data(data, fraction, resource, min_bars):
+    # 按预算截取数据：history截取每个股票的历史前缀，symbols截取部分股票
+    if resource == 'symbols':
+        symbols = list(data)
+        count = max(1, math.ceil(len(symbols) * fraction))
+        return {symbol: data[symbol] for symbol in symbols[:count]}
+
+    sliced = {}
+    for symbol, df in data.items():
+        bars = min(len(df), max(min_bars, int(len(df) * fraction)))
+        sliced[symbol] = df.iloc[:bars]
+    return sliced
+
+
+def _score(runner, strategy_class, params, data, metric, initial_cash):
+    # 多只股票取指标均值；任一股票指标缺失（如夏普比率为None）则得分为None
+    results = {symbol: runner(strategy_class, params, df, initial_cash)
+               for symbol, df in data.items()}
+    scores = [result.get(metric) if result else None for result in results.values()]
+    if any(value is None or np.isnan(value) for value in scores):
+        return None, results
+    return float(np.mean(scores)), results
+
+
+def _rank_key(score, metric):
+    # 排序键：指标缺失排在最后，其余按指标方向从优到劣
+    if score is None:
+        return (1, 0.0)
+    return (0, score if metric in MINIMIZE_METRICS else -score)
+
+
+def successive_halving(strategy_class, param_grid, data, metric='total_return', eta=3,
+                       min_fraction=1 / 3, resource='history', min_bars=60,
+                       initial_cash=100000.0, runner=None):
+    """
+    逐轮淘汰的参数优化：先用少量数据评估全部参数组合，淘汰排名靠后的部分，
+    再用更多数据评估幸存组合，直到最后一轮使用全部数据
+
+    参数:
+    strategy_class: 策略类
+    param_grid (dict): 参数网格，键为参数名，值为候选取值列表
+    data (pandas.DataFrame 或 dict): 股票数据，或股票代码到数据的字典
+    metric (str): 排序指标，如'sharpe_ratio'、'total_return'、'max_drawdown'
+    eta (int): 每轮保留 1/eta 的参数组合，同时数据量扩大 eta 倍
+    min_fraction (float): 第一轮使用的数据比例
+    resource (str): 'history'按历史长度分配预算，'symbols'按股票数量分配预算
+    min_bars (int): history模式下的最少bar数，保证指标有足够的预热期。
+    注意run_strategy的夏普比率按年计算，历史前缀不足跨年时均为None，该轮不做淘汰
+    initial_cash (float): 初始资金
+    runner: 回测函数，签名与run_strategy一致，默认使用run_strategy
+
+    返回:
+    dict: 包含最优参数best_params、最优得分best_score、全量数据回测结果best_result，
+    以及每轮评估记录history
+    """
+    if runner is None:
+        from run_backtest import run_strategy
+        runner = run_strategy
+
+    if not isinstance(data, dict):
+        data = {'data': data}
+
+    candidates = expand_grid(param_grid)
+    rounds = max(0, math.ceil(math.log(1.0 / min_fraction, eta)))
+    history = []
+
+    for r in range(rounds + 1):
+        fraction = min(1.0, min_fraction * eta ** r)
+        if r == rounds:
+            fraction = 1.0
+        round_data = _slice_data(data, fraction, resource, min_bars)
+
+        scored = []
+        for params in candidates:
+            score, results = _score(runner, strategy_class, params, round_data, metric, initial_cash)
+            scored.append((score, params, results))
+        scored.sort(key=lambda item: _rank_key(item[0], metric))
+        history.append({
+            'round': r + 1,
+            'fraction': fraction,
+            'scores': [(score, params) for score, params, _ in scored]
+        })
+
+        if r == rounds:
+            break
+
+        # 与最后一名幸存者得分相同的组合无法区分，一并保留
+        keep = max(1, math.ceil(len(scored) / eta))
+        while keep < len(scored) and scored[keep][0] == scored[keep - 1][0]:
+            keep += 1
+        candidates = [params for _, params, _ in scored[:keep]]
+        print(f'第{r + 1}轮: 数据比例 {fraction:.0%}, 评估 {len(scored)} 组参数, '
+              f'保留 {keep} 组, 淘汰 {len(scored) - keep} 组')
+        for score, params, _ in scored[keep:]:
+            print(f'  淘汰 {params}, {metric}: {score}')
+
+    best_score, best_params, best_result = scored[0]
+    print(f'最优参数: {best_params}, {metric}: {best_score}')
+
+    if list(best_result) == ['data']:
+        best_result = best_result['data']
+
+    return {
+        'best_params': best_params,
+        'best_score': best_score,
+        'best_result': best_result,
+        'history': history
+    }
@@ -0,0 +1,146 @@
+import atexit
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# 共享的行情列，与backtrader的PandasData默认列一致
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# 工作进程内已挂载的共享内存，按名称缓存，保证DataFrame引用的缓冲区不被释放
+_attached = {}
+
+
+class SharedDataStore:
+    """
+    将各股票的OHLCV数据一次性放入共享内存，供多个进程按名称挂载，避免在每个进程中复制数据
+
+    用法:
+    with SharedDataStore() as store:
+        store.add('000001', data)
+        results = run_parallel(jobs, store)
+    """
+
+    def __init__(self):
+        self._segments = []
+        self.descriptors = {}
+        atexit.register(self.close)
+
+    def add(self, symbol, data):
+        """
+        将一只股票的数据写入共享内存
+
+        参数:
+        symbol (str): 股票代码
+        data (pandas.DataFrame): 股票数据，需包含OHLCV列和日期索引
+
+        返回:
+        dict: 该股票的共享内存描述，可传给attach在其他进程中挂载
+        """
+        values = np.ascontiguousarray(data[OHLCV_COLUMNS].to_numpy(dtype=np.float64).T)
+        dates = pd.DatetimeIndex(data.index).values.astype('datetime64[ns]').view(np.int64)
+
+        values_shm = self._create(values)
+        dates_shm = self._create(dates)
+
+        self.descriptors[symbol] = {
+            'values': values_shm.name,
+            'dates': dates_shm.name,
+            'rows': len(dates),
+        }
+        return self.descriptors[symbol]
+
+    def _create(self, array):
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+        self._segments.append(shm)
+        return shm
+
+    def close(self):
+        """
+        释放并删除本对象创建的全部共享内存
+        """
+        while self._segments:
+            shm = self._segments.pop()
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.descriptors = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _attach_segment(name):
+    if name not in _attached:
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python 3.13之前挂载也会登记到resource_tracker；工作进程与主进程共用同一个
+            # resource_tracker，重复登记无影响，删除仍由主进程的close负责
+            shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+    return _attached[name]
+
+
+def attach(descriptor):
+    """
+    按描述挂载共享内存中的股票数据，不复制数据
+
+    参数:
+    descriptor (dict): SharedDataStore.add返回的描述
+
+    返回:
+    pandas.DataFrame: 只读的股票数据，各列直接引用共享内存
+    """
+    rows = descriptor['rows']
+    values = np.ndarray((len(OHLCV_COLUMNS), rows), dtype=np.float64,
+                        buffer=_attach_segment(descriptor['values']).buf)
+    dates = np.ndarray((rows,), dtype='datetime64[ns]',
+                       buffer=_attach_segment(descriptor['dates']).buf)
+    values.flags.writeable = False
+    dates.flags.writeable = False
+
+    index = pd.DatetimeIndex(dates, copy=False, name='date')
+    return pd.DataFrame(values.T, index=index, columns=OHLCV_COLUMNS, copy=False)
+
+
+def _init_worker(descriptors):
+    global _worker_descriptors
+    _worker_descriptors = descriptors
+
+
+def _run_job(job):
+    runner, strategy_class, params, symbol, initial_cash = job
+    data = attach(_worker_descriptors[symbol])
+    return runner(strategy_class, params, data, initial_cash)
+
+
+def run_parallel(jobs, store, processes=None, runner=None, initial_cash=100000.0):
+    """
+    在多个进程中并行回测，各进程挂载共享内存中的数据，而不是各自接收一份DataFrame
+
+    参数:
+    jobs (list): (策略类, 策略参数, 股票代码) 组成的任务列表
+    store (SharedDataStore): 已写入数据的共享数据
+    processes (int): 进程数，默认为CPU核数
+    runner: 回测函数，签名与run_strategy一致，默认使用run_strategy
+    initial_cash (float): 初始资金
+
+    返回:
+    list: 与jobs顺序一致的回测结果
+    """
+    if runner is None:
+        from run_backtest import run_strategy
+        runner = run_strategy
+
+    tasks = [(runner, strategy_class, params, symbol, initial_cash)
+             for strategy_class, params, symbol in jobs]
+    with mp.Pool(processes, initializer=_init_worker, initargs=(store.descriptors,)) as pool:
+        return pool.map(_run_job, tasks)